@@ -0,0 +1,207 @@
+import sys
+import threading
+from collections import namedtuple
+
+import pyautogui
+from PIL import Image
+
+try:
+    import mss
+except ImportError:  # Without mss we fall back to pyautogui's single primary screen
+    mss = None
+
+# --- CONFIGURATION ---
+BASE_DPI = 96.0
+LAYOUT_CHECK_INTERVAL_MS = 2000  # How often the cheap layout signature is compared
+
+
+class Monitor(namedtuple("Monitor", ["left", "top", "width", "height", "scale"])):
+    """A single physical monitor in virtual-desktop pixel coordinates."""
+    __slots__ = ()
+
+    @property
+    def right(self):
+        return self.left + self.width
+
+    @property
+    def bottom(self):
+        return self.top + self.height
+
+    @property
+    def dpi(self):
+        return BASE_DPI * self.scale
+
+    def contains(self, x, y):
+        return self.left <= x < self.right and self.top <= y < self.bottom
+
+    def distance_to(self, x, y):
+        dx = max(self.left - x, 0, x - self.right)
+        dy = max(self.top - y, 0, y - self.bottom)
+        return dx * dx + dy * dy
+
+
+class MonitorTopology:
+    """
+    Enumerates and caches the monitor layout of the desktop. The cache is only
+    rebuilt when the layout actually changes: every monitor's geometry is
+    re-read and compared periodically, and a failed grab also forces a
+    re-read.
+
+    Hand coordinates are normalized over the bounding box of all monitors,
+    and a selection is clipped to the monitor it falls on, so captures only
+    ever touch that monitor's pixels.
+
+    Per-monitor DPI scale is only available on Windows; elsewhere every
+    monitor reports Tk's single screen DPI.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.monitors = []
+        self.virtual = None
+        self._dirty = True
+        self._signature = None
+        self._lock = threading.Lock()
+        self._local = threading.local()  # mss handles must not cross threads
+
+        self.refresh()
+        self._signature = self._layout_signature()
+        self.root.after(LAYOUT_CHECK_INTERVAL_MS, self._check_layout)
+
+    # --- Change Tracking ---
+    def _check_layout(self):
+        signature = self._layout_signature()
+        if signature != self._signature:
+            self._signature = signature
+            self.invalidate()
+        self.root.after(LAYOUT_CHECK_INTERVAL_MS, self._check_layout)
+
+    def _layout_signature(self):
+        """
+        The geometry of every monitor, read fresh. A new mss handle is needed
+        because mss caches its monitor list per instance (and Tk's screen size
+        never follows XRandR changes).
+        """
+        try:
+            if mss is not None:
+                with mss.mss() as sct:
+                    return tuple((m["left"], m["top"], m["width"], m["height"]) for m in sct.monitors[1:])
+            return tuple(pyautogui.size())
+        except Exception:
+            return None
+
+    def invalidate(self):
+        """Marks the cached layout as stale; it is re-read on next access."""
+        self._dirty = True
+
+    def refresh(self):
+        """Re-enumerates the monitors if the cached layout is stale."""
+        with self._lock:
+            if not self._dirty:
+                return
+            monitors = self._enumerate()
+            changed = monitors != self.monitors
+            self.monitors = monitors
+            self.virtual = Monitor(
+                min(m.left for m in monitors), min(m.top for m in monitors),
+                max(m.right for m in monitors) - min(m.left for m in monitors),
+                max(m.bottom for m in monitors) - min(m.top for m in monitors),
+                1.0)
+            self._dirty = False
+        if changed:
+            print(f"Detected {len(monitors)} monitor(s): " +
+                  ", ".join(f"{m.width}x{m.height}+{m.left}+{m.top}@{m.scale:g}x" for m in monitors))
+
+    def _enumerate(self):
+        if mss is not None:
+            try:
+                with mss.mss() as sct:
+                    # Index 0 is the combined virtual screen; the rest are real monitors.
+                    layout = sct.monitors[1:]
+                if layout:
+                    return [Monitor(m["left"], m["top"], m["width"], m["height"], self._monitor_scale(m))
+                            for m in layout]
+            except Exception as e:
+                print(f"Could not enumerate monitors: {e}")
+        width, height = pyautogui.size()
+        return [Monitor(0, 0, width, height, self._monitor_scale(None))]
+
+    def _monitor_scale(self, mon):
+        """Returns the DPI scale factor of a monitor (1.0 at 96 DPI)."""
+        if mon is not None and sys.platform == "win32":
+            try:
+                import ctypes
+                from ctypes import wintypes
+                point = wintypes.POINT(mon["left"] + mon["width"] // 2, mon["top"] + mon["height"] // 2)
+                handle = ctypes.windll.user32.MonitorFromPoint(point, 2)  # MONITOR_DEFAULTTONEAREST
+                dpi_x, dpi_y = ctypes.c_uint(), ctypes.c_uint()
+                ctypes.windll.shcore.GetDpiForMonitor(handle, 0, ctypes.byref(dpi_x), ctypes.byref(dpi_y))
+                return dpi_x.value / BASE_DPI
+            except Exception:
+                pass
+        try:
+            return self.root.winfo_fpixels("1i") / BASE_DPI
+        except Exception:
+            return 1.0
+
+    # --- Coordinate Mapping ---
+    def to_screen(self, nx, ny):
+        """Maps normalized [0, 1] coordinates onto the virtual desktop."""
+        self.refresh()
+        v = self.virtual
+        return v.left + nx * v.width, v.top + ny * v.height
+
+    def to_normalized(self, x, y):
+        """Inverse of to_screen()."""
+        v = self.virtual
+        return (x - v.left) / v.width, (y - v.top) / v.height
+
+    def monitor_at(self, x, y):
+        """Returns the monitor containing the point, or the nearest one."""
+        self.refresh()
+        for m in self.monitors:
+            if m.contains(x, y):
+                return m
+        return min(self.monitors, key=lambda m: m.distance_to(x, y))
+
+    def clip_region(self, x1, y1, x2, y2):
+        """
+        Picks the monitor under the centre of a selection box and clips the
+        box to it.
+        :return: A tuple of (monitor, (left, top, width, height)).
+        """
+        monitor = self.monitor_at((x1 + x2) / 2, (y1 + y2) / 2)
+        left = int(max(monitor.left, min(x1, x2)))
+        top = int(max(monitor.top, min(y1, y2)))
+        right = int(min(monitor.right, max(x1, x2)))
+        bottom = int(min(monitor.bottom, max(y1, y2)))
+        return monitor, (left, top, max(0, right - left), max(0, bottom - top))
+
+    # --- Capture ---
+    def grab(self, region):
+        """
+        Captures a (left, top, width, height) region as an RGB PIL image,
+        reading only that region of the monitor's buffer.
+        """
+        if region[2] <= 0 or region[3] <= 0:
+            raise ValueError(f"Cannot grab an empty region: {region}")
+        try:
+            if mss is None:
+                return pyautogui.screenshot(region=region)
+            sct = getattr(self._local, "sct", None)
+            if sct is None:
+                sct = self._local.sct = mss.mss()
+            left, top, width, height = region
+            shot = sct.grab({"left": left, "top": top, "width": width, "height": height})
+            return Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX")
+        except Exception:
+            # A failed grab usually means the layout changed under us.
+            self.invalidate()
+            raise
+
+    def close_thread_handle(self):
+        """Releases the calling thread's mss handle; worker threads call this on exit."""
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            self._local.sct = None
+            sct.close()
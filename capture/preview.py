@@ -0,0 +1,116 @@
+import threading
+import zlib
+from PIL import Image
+
+# --- CONFIGURATION ---
+MOVE_THRESHOLD_PX = 4  # Region edges must move this far to force a re-render
+MIN_PROBE_INTERVAL = 0.05  # Probe rate right after a change
+MAX_PROBE_INTERVAL = 1.0  # Probe rate once the screen has been still for ~1.5 s
+
+
+class PreviewRenderer:
+    """
+    Renders the live preview on a background thread, so the camera loop never
+    waits for a screen grab or resize.
+
+    A new preview is only rendered when the selection moves by more than
+    MOVE_THRESHOLD_PX, or when a checksum over every pixel of the grabbed
+    region says its content changed. While nothing changes, the probe interval
+    doubles from MIN_PROBE_INTERVAL up to MAX_PROBE_INTERVAL, so a still
+    selection costs one grab per second. The price is latency: a change right
+    after another shows within 50-200 ms, but one after ~1.5 s of stillness can
+    take up to a second to appear. Moving the selection always re-renders
+    immediately. While paused (e.g. a recording is grabbing the same pixels)
+    the renderer does no work at all and keeps showing its last image.
+    """
+
+    def __init__(self, screen, width):
+        self.screen = screen
+        self.width = width
+        self.image = None  # Latest rendered preview, read by the UI thread
+
+        self._lock = threading.Lock()
+        self._region = None
+        self._rendered_region = None
+        self._checksum = None
+        self._paused = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="PreviewRenderer", daemon=True)
+        self._thread.start()
+
+    def update_region(self, region):
+        """Called every frame with the current selection (or None to clear)."""
+        with self._lock:
+            self._region = region
+            if region is None:
+                self.image = None
+                self._rendered_region = None
+                self._checksum = None
+                return
+            moved = self._has_moved(region)
+        if moved:
+            self._wake.set()
+
+    def set_paused(self, paused):
+        self._paused = paused
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _has_moved(self, region):
+        if self._rendered_region is None:
+            return True
+        return any(abs(a - b) > MOVE_THRESHOLD_PX for a, b in zip(region, self._rendered_region))
+
+    def _run(self):
+        try:
+            interval = MIN_PROBE_INTERVAL
+            while not self._stop.is_set():
+                self._wake.wait(interval if self._region and not self._paused else None)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                if self._paused:
+                    interval = MIN_PROBE_INTERVAL
+                    continue
+
+                with self._lock:
+                    region = self._region
+                    if region is None:
+                        continue
+                    # Sub-threshold jitter keeps probing the region already shown.
+                    moved = self._has_moved(region)
+                    if not moved:
+                        region = self._rendered_region
+                if region[2] <= 0 or region[3] <= 0:
+                    continue
+
+                try:
+                    changed = self._probe_and_render(region, moved)
+                except Exception:
+                    # print(f"Could not create preview: {e}") # Can be noisy
+                    changed = False
+                interval = MIN_PROBE_INTERVAL if changed else min(MAX_PROBE_INTERVAL, interval * 2)
+        finally:
+            self.screen.close_thread_handle()
+
+    def _probe_and_render(self, region, moved):
+        shot = self.screen.grab(region)
+        checksum = zlib.crc32(shot.tobytes())
+        if not moved and checksum == self._checksum:
+            return False
+
+        _, _, width, height = region
+        display_h = int(self.width * height / width)
+        image = shot.resize((self.width, display_h), Image.Resampling.BILINEAR)
+
+        with self._lock:
+            if self._region is None:  # Cleared while we were rendering
+                return False
+            self.image = image
+            self._rendered_region = region
+            self._checksum = checksum
+        return True
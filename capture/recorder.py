@@ -0,0 +1,135 @@
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# --- CONFIGURATION ---
+RECORD_FPS = 15
+QUEUE_SIZE = 30  # Max frames buffered between grabber and encoder (~2 s at 15 fps)
+FOURCC = "mp4v"
+SHUTDOWN_TIMEOUT = 5.0  # Max seconds stop(wait=True) waits for the file to be finalized
+
+
+class RegionRecorder:
+    """
+    Records a screen region to a video file. A grabber thread captures frames
+    at a fixed cadence and hands them to an encoder thread through a bounded
+    queue, so memory stays flat however long the recording runs and the
+    caller never waits on either.
+
+    When the encoder falls behind, frames are dropped instead of queued; the
+    encoder repeats the previous frame over the gap so playback keeps real time.
+    """
+
+    def __init__(self, screen, region, path, fps=RECORD_FPS):
+        left, top, width, height = region
+        # Most codecs want even frame dimensions.
+        self.region = (left, top, width - width % 2, height - height % 2)
+        self.screen = screen
+        self.path = path
+        self.fps = fps
+
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.start_time = None
+        self.end_time = None
+        self.is_finished = False
+
+        self._frames = queue.Queue(maxsize=QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._grabber = threading.Thread(target=self._grab_loop, name="RecorderGrab", daemon=True)
+        self._encoder = threading.Thread(target=self._encode_loop, name="RecorderEncode", daemon=True)
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self._encoder.start()
+        self._grabber.start()
+
+    def stop(self, wait=False):
+        """
+        Stops grabbing; the encoder drains the queue and finalizes the file on
+        its own. Pass wait=True on shutdown: the threads are daemons, and an
+        MP4 whose writer was never released has no index and won't play.
+        """
+        self._stop.set()
+        if wait:
+            deadline = time.perf_counter() + SHUTDOWN_TIMEOUT
+            for thread in (self._grabber, self._encoder):
+                if thread.is_alive():
+                    thread.join(max(0.0, deadline - time.perf_counter()))
+
+    @property
+    def elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.perf_counter()) - self.start_time
+
+    @property
+    def achieved_fps(self):
+        return self.captured / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"Recording {self.path}: {self.elapsed:.1f} s, {self.captured} frames "
+                f"at {self.achieved_fps:.1f}/{self.fps} fps, {self.dropped} dropped")
+
+    # --- Worker Threads ---
+    def _grab_loop(self):
+        last_slot = -1
+        while not self._stop.is_set():
+            slot = int((time.perf_counter() - self.start_time) * self.fps)
+            if slot > last_slot:
+                try:
+                    image = self.screen.grab(self.region)
+                except Exception as e:
+                    print(f"Error grabbing recording frame: {e}")
+                    break
+                try:
+                    self._frames.put_nowait((slot, image))
+                    self.captured += 1
+                except queue.Full:
+                    self.dropped += 1
+                # Slots we were too slow to grab at all count as dropped too.
+                self.dropped += slot - last_slot - 1
+                last_slot = slot
+            next_time = self.start_time + (last_slot + 1) / self.fps
+            self._stop.wait(max(0.0, next_time - time.perf_counter()))
+
+        self.end_time = time.perf_counter()
+        self.screen.close_thread_handle()
+        # Only give up on the end marker if the encoder is gone; otherwise wait for room.
+        while self._encoder.is_alive():
+            try:
+                self._frames.put((None, None), timeout=0.5)
+                break
+            except queue.Full:
+                pass
+
+    def _encode_loop(self):
+        _, _, width, height = self.region
+        writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*FOURCC), self.fps, (width, height))
+        if not writer.isOpened():
+            print(f"Error: Could not open video writer for {self.path}")
+            self._stop.set()
+
+        last_slot, last_frame = -1, None
+        try:
+            while True:
+                slot, image = self._frames.get()
+                if image is None:
+                    break
+                if not writer.isOpened():
+                    continue  # Keep draining so the grabber can exit
+                frame = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+                if last_frame is not None:
+                    for _ in range(slot - last_slot - 1):
+                        writer.write(last_frame)
+                writer.write(frame)
+                self.written += 1
+                last_slot, last_frame = slot, frame
+        finally:
+            writer.release()
+            self.is_finished = True
+            print(self.summary())
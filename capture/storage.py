@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from PIL import Image, ImageChops
+
+# --- CONFIGURATION ---
+OBJECTS_DIR = "objects"
+INDEX_FILENAME = "index.json"
+HASH_SIZE = 8  # dHash on a 9x8 thumbnail -> 64-bit fingerprint
+NEAR_DUPLICATE_DISTANCE = 3  # Max differing hash bits to consider a candidate; None disables
+CONFIRM_MAX_DIFFERENCE = 2  # Max per-pixel channel difference still counted as the same image
+
+
+class ScreenshotStore:
+    """
+    Stores screenshots content-addressed under `<root>/objects/`, and exposes
+    them under friendly timestamped names in `<root>/` via hard links. A name
+    index (`index.json`) maps every friendly name to its blob.
+
+    Before encoding a capture, a perceptual hash is computed on a tiny
+    downsampled copy. Earlier captures of the same size whose hash is within a
+    few bits are only candidates: each is confirmed against the full-resolution
+    blob, where no pixel may differ by more than CONFIRM_MAX_DIFFERENCE, so a
+    single changed character still gets its own blob. On an exact or confirmed
+    match the PNG encode and write are skipped and the new name is linked to
+    the blob.
+
+    Because names are hard links, all names of a blob share one file. Edit
+    copies, not the files in the screenshots folder, or every alias changes.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        self.objects_dir = os.path.join(root_dir, OBJECTS_DIR)
+        self.index_path = os.path.join(root_dir, INDEX_FILENAME)
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.names = {}  # friendly name -> blob digest
+        self.blobs = {}  # blob digest -> {"path", "phash", "size"}
+        self._load_index()
+
+        # --- Statistics ---
+        self.captures = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.bytes_written = 0
+        self.encode_seconds = 0.0
+
+    def save(self, image, dpi=None):
+        """
+        Stores an image and returns the path of its new friendly name.
+        """
+        self.captures += 1
+        phash = self._perceptual_hash(image)
+        # Mode and size are part of the address: flat images of different shapes share bytes.
+        digest = hashlib.sha256(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode() +
+                                image.tobytes()).hexdigest()
+
+        if digest in self.blobs:
+            self.exact_hits += 1
+        else:
+            match = self._find_near_duplicate(image, phash)
+            if match:
+                self.near_hits += 1
+                digest = match
+            else:
+                self._write_blob(image, digest, phash, dpi)
+
+        path = self._link_name(digest)
+        self._save_index()
+        print(self.summary())
+        return path
+
+    @property
+    def hit_rate(self):
+        return (self.exact_hits + self.near_hits) / self.captures if self.captures else 0.0
+
+    def summary(self):
+        return (f"Screenshot store: {self.captures} captures, "
+                f"{self.exact_hits} exact + {self.near_hits} near duplicates "
+                f"({self.hit_rate:.0%} dedup hit rate), "
+                f"{self.bytes_written / 1024:.0f} KiB written, "
+                f"{self.encode_seconds * 1000:.0f} ms encoding")
+
+    # --- Hashing ---
+    def _perceptual_hash(self, image):
+        """Difference hash: compares neighbouring pixels of a 9x8 greyscale thumbnail."""
+        thumb = image.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR,
+                             reducing_gap=2.0).convert("L")
+        pixels = thumb.tobytes()
+        bits = 0
+        for row in range(HASH_SIZE):
+            for col in range(HASH_SIZE):
+                left = pixels[row * (HASH_SIZE + 1) + col]
+                right = pixels[row * (HASH_SIZE + 1) + col + 1]
+                bits = (bits << 1) | (left > right)
+        return bits
+
+    def _find_near_duplicate(self, image, phash):
+        if NEAR_DUPLICATE_DISTANCE is None:
+            return None
+        candidates = []
+        for digest, blob in self.blobs.items():
+            if tuple(blob["size"]) != image.size:
+                continue
+            distance = (phash ^ blob["phash"]).bit_count()
+            if distance <= NEAR_DUPLICATE_DISTANCE:
+                candidates.append((distance, digest))
+
+        rgb = None
+        for _, digest in sorted(candidates):
+            if rgb is None:
+                rgb = image.convert("RGB")
+            if self._matches_blob(rgb, digest):
+                return digest
+        return None
+
+    def _matches_blob(self, rgb, digest):
+        """Confirms a hash candidate by comparing every pixel against the stored blob."""
+        try:
+            with Image.open(os.path.join(self.root_dir, self.blobs[digest]["path"])) as stored:
+                stored_rgb = stored.convert("RGB")
+        except OSError:
+            return False
+        extrema = ImageChops.difference(rgb, stored_rgb).getextrema()
+        return max(high for _, high in extrema) <= CONFIRM_MAX_DIFFERENCE
+
+    # --- Storage ---
+    def _write_blob(self, image, digest, phash, dpi):
+        blob_path = os.path.join(self.objects_dir, digest[:2], f"{digest}.png")
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+
+        start = time.perf_counter()
+        if dpi:
+            image.save(blob_path, dpi=(dpi, dpi))
+        else:
+            image.save(blob_path)
+        self.encode_seconds += time.perf_counter() - start
+        self.bytes_written += os.path.getsize(blob_path)
+
+        self.blobs[digest] = {"path": os.path.relpath(blob_path, self.root_dir),
+                              "phash": phash, "size": list(image.size)}
+
+    def _link_name(self, digest):
+        """Creates a unique friendly name pointing at the blob."""
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        name, counter = f"GestureShot_{stamp}.png", 1
+        while name in self.names or os.path.exists(os.path.join(self.root_dir, name)):
+            counter += 1
+            name = f"GestureShot_{stamp}_{counter}.png"
+
+        blob_path = os.path.join(self.root_dir, self.blobs[digest]["path"])
+        path = os.path.join(self.root_dir, name)
+        try:
+            os.link(blob_path, path)
+        except OSError:
+            # Filesystems without hard links still get a usable file.
+            shutil.copyfile(blob_path, path)
+        self.names[name] = digest
+        return path
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            self.names = data.get("names", {})
+            self.blobs = {digest: dict(blob, phash=int(blob["phash"], 16))
+                          for digest, blob in data.get("blobs", {}).items()
+                          if os.path.exists(os.path.join(self.root_dir, blob["path"]))}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not read screenshot index, starting fresh: {e}")
+            self.names, self.blobs = {}, {}
+
+    def _save_index(self):
+        data = {
+            "names": self.names,
+            "blobs": {digest: dict(blob, phash=f"{blob['phash']:016x}")
+                      for digest, blob in self.blobs.items()},
+        }
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.index_path)
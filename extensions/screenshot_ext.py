@@ -1,18 +1,20 @@
 import cv2
-import pyautogui
 import os
 import time
-from PIL import Image
 from .base_extension import GestureExtension
+from capture.preview import PreviewRenderer
+from capture.recorder import RegionRecorder
+from capture.storage import ScreenshotStore
 
 # --- CONFIGURATION ---
 SCREENSHOTS_DIR = "screenshots"
+RECORDINGS_DIR = "recordings"
 EDGE_MARGIN = 0.08
 SMOOTHING_FACTOR = 0.2
 CAPTURE_COUNTDOWN_SECONDS = 3
 SCREENSHOT_COOLDOWN = 3
 PREVIEW_WIDTH = 480
-PREVIEW_UPDATE_INTERVAL = 0.2  # Update preview 5 times per second (1 / 0.2 = 5)
+RECORD_CONFIRM_FRAMES = 10  # Both pinkies must be held this long to start/stop recording
 
 
 class ScreenshotExtension(GestureExtension):
@@ -25,15 +27,23 @@ class ScreenshotExtension(GestureExtension):
         self.is_capture_mode = False
         self.countdown_start_time = 0
         self.locked_region = None
+        self.locked_monitor = None
+        self.current_monitor = None
+        self.current_region = None
         self.last_screenshot_time = 0
         self.saved_message_end_time = 0
+        self.recorder = None
+        self.record_gesture_frames = 0
+        self.record_error_end_time = 0
 
         # --- Performance State ---
-        self.last_preview_update_time = 0
-        self.cached_preview_image = None
+        self.preview = PreviewRenderer(self.app.screen, PREVIEW_WIDTH)
 
         if not os.path.exists(SCREENSHOTS_DIR):
             os.makedirs(SCREENSHOTS_DIR)
+        self.store = ScreenshotStore(SCREENSHOTS_DIR)
+        if not os.path.exists(RECORDINGS_DIR):
+            os.makedirs(RECORDINGS_DIR)
 
     def check_for_activation(self, results, frame):
         # Activate if two hands are detected
@@ -66,26 +76,32 @@ class ScreenshotExtension(GestureExtension):
         _, raw_coords = self._apply_edge_snapping(points)
         self._smooth_coordinates(raw_coords)
 
-        sx1, sy1, sx2, sy2 = [int(c) for c in self.smoothed_coords]
-        s_width, s_height = self._clamp_coordinates(sx1, sy1, sx2 - sx1, sy2 - sy1)
+        self.current_monitor, self.current_region = self.app.screen.clip_region(*self.smoothed_coords)
 
-        is_trigger_gesture = self._is_pinky_up(left_hand_landmarks) or self._is_pinky_up(right_hand_landmarks)
-        self._handle_capture_mode(frame, is_trigger_gesture, (sx1, sy1, s_width, s_height))
+        left_pinky_up = self._is_pinky_up(left_hand_landmarks)
+        right_pinky_up = self._is_pinky_up(right_hand_landmarks)
+        if self._handle_recording(left_pinky_up and right_pinky_up):
+            return
+
+        is_trigger_gesture = left_pinky_up or right_pinky_up
+        self._handle_capture_mode(frame, is_trigger_gesture, self.current_region)
 
     def draw_feedback(self, frame):
-        # This is where the preview is generated, now throttled
-        preview_img = self._update_preview()
+        # The preview is rendered in the background; only pick up the latest one
+        self.preview.update_region(self.current_region)
+        preview_img = self.preview.image
 
         # Draw visual feedback on the webcam frame
         if self.smoothed_coords:
             points_norm = [
-                (c[0] / self.app.SCREEN_WIDTH, c[1] / self.app.SCREEN_HEIGHT)
+                self.app.screen.to_normalized(*c)
                 for c in [(self.smoothed_coords[0], self.smoothed_coords[1]),
                           (self.smoothed_coords[2], self.smoothed_coords[3])]
             ]
 
             rect_color = (0, 255, 0)  # Green: Framing
             if self.is_capture_mode: rect_color = (0, 255, 255)  # Yellow: Locked-in
+            if self.recorder: rect_color = (0, 0, 255)  # Red: Recording
 
             frame_x1 = int(points_norm[0][0] * self.app.WEBCAM_WIDTH)
             frame_y1 = int(points_norm[0][1] * self.app.WEBCAM_HEIGHT)
@@ -96,7 +112,11 @@ class ScreenshotExtension(GestureExtension):
             cv2.rectangle(overlay, (frame_x1, frame_y1), (frame_x2, frame_y2), rect_color, -1)
             frame = cv2.addWeighted(overlay, 0.3, frame, 0.7, 0)
             cv2.rectangle(frame, (frame_x1, frame_y1), (frame_x2, frame_y2), rect_color, 2)
-            self.app.draw_text(frame, "Raise pinky to capture", (10, 30))
+            if self.recorder:
+                self.app.draw_text(frame, "HOLD both pinkies to stop", (10, 30))
+            else:
+                self.app.draw_text(frame, "Raise pinky to capture", (10, 30))
+                self.app.draw_text(frame, "HOLD both pinkies to record", (10, 60))
 
         if self.is_capture_mode:
             time_left = CAPTURE_COUNTDOWN_SECONDS - (time.time() - self.countdown_start_time)
@@ -108,42 +128,13 @@ class ScreenshotExtension(GestureExtension):
 
         return frame, preview_img
 
-    def _update_preview(self):
-        """
-        Takes a screenshot for the preview, but only if enough time has passed
-        since the last one. Otherwise, returns the cached image.
-        """
-        current_time = time.time()
-        if current_time - self.last_preview_update_time < PREVIEW_UPDATE_INTERVAL:
-            return self.cached_preview_image  # Return the old one
-
-        self.last_preview_update_time = current_time
-
-        if self.smoothed_coords:
-            sx1, sy1, sx2, sy2 = [int(c) for c in self.smoothed_coords]
-            width, height = sx2 - sx1, sy2 - sy1
-
-            if width > 0 and height > 0:
-                try:
-                    preview_pil = pyautogui.screenshot(region=(sx1, sy1, width, height))
-                    aspect_ratio = height / width if width > 0 else 1
-                    display_h = int(PREVIEW_WIDTH * aspect_ratio)
-                    # OPTIMIZATION: Use a faster resizing algorithm for the preview
-                    self.cached_preview_image = preview_pil.resize((PREVIEW_WIDTH, display_h), Image.Resampling.BILINEAR)
-                    return self.cached_preview_image
-                except Exception as e:
-                    # print(f"Could not create preview: {e}") # Can be noisy
-                    pass
-
-        self.cached_preview_image = None
-        return None
-
     def _handle_capture_mode(self, frame, is_trigger_gesture, region):
         if not self.is_capture_mode:
             if is_trigger_gesture:
                 self.is_capture_mode = True
                 self.countdown_start_time = time.time()
                 self.locked_region = region
+                self.locked_monitor = self.current_monitor
         else:
             if not is_trigger_gesture:
                 self.is_capture_mode = False
@@ -155,15 +146,15 @@ class ScreenshotExtension(GestureExtension):
             else:
                 if time.time() - self.last_screenshot_time > SCREENSHOT_COOLDOWN:
                     self.last_screenshot_time = time.time()
+                    self.app.mark_frame_outlier()
                     try:
                         self.app.root.withdraw()
                         time.sleep(0.1)
-                        screenshot = pyautogui.screenshot(region=self.locked_region)
+                        screenshot = self.app.screen.grab(self.locked_region)
                         self.app.root.deiconify()
 
-                        filename = os.path.join(SCREENSHOTS_DIR, f"GestureShot_{time.strftime('%Y%m%d-%H%M%S')}.png")
-                        screenshot.save(filename)
-                        self.app.last_screenshot_path = filename
+                        dpi = self.locked_monitor.dpi if self.locked_monitor else None
+                        self.app.last_screenshot_path = self.store.save(screenshot, dpi=dpi)
                         self.saved_message_end_time = time.time() + 2
                     except Exception as e:
                         print(f"Error taking screenshot: {e}")
@@ -171,9 +162,83 @@ class ScreenshotExtension(GestureExtension):
                             self.app.root.deiconify()
                 self.is_capture_mode = False
 
+    def _handle_recording(self, is_record_gesture):
+        """
+        Toggles recording when both pinkies are held. Returns True while the
+        gesture is held or a recording is running, so no screenshot triggers.
+        """
+        self.record_gesture_frames = self.record_gesture_frames + 1 if is_record_gesture else 0
+        if self.record_gesture_frames == RECORD_CONFIRM_FRAMES:
+            if self.recorder:
+                self._stop_recording()
+            else:
+                self._start_recording()
+        if is_record_gesture:
+            self.is_capture_mode = False
+        return is_record_gesture or self.recorder is not None
+
+    def _start_recording(self):
+        if not self.current_region or self.current_region[2] < 2 or self.current_region[3] < 2:
+            return
+        filename = self._recording_path()
+        self.recorder = RegionRecorder(self.app.screen, self.current_region, filename)
+        self.recorder.start()
+        self.preview.set_paused(True)
+        print(f"Recording {self.current_region} to {filename}")
+
+    def _stop_recording(self, wait=False):
+        # Unless waiting, the encoder finishes the file in the background and prints a summary.
+        self.recorder.stop(wait=wait)
+        self.recorder = None
+        self.preview.set_paused(False)
+        self.saved_message_end_time = time.time() + 2
+
+    def _recording_path(self):
+        """A timestamped name with a counter suffix, so quick restarts don't overwrite."""
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path, counter = os.path.join(RECORDINGS_DIR, f"GestureShot_{stamp}.mp4"), 1
+        while os.path.exists(path):
+            counter += 1
+            path = os.path.join(RECORDINGS_DIR, f"GestureShot_{stamp}_{counter}.mp4")
+        return path
+
+    def _poll_recorder(self):
+        """Clears a recorder whose threads ended on their own (grab or encode error)."""
+        if self.recorder and self.recorder.is_finished:
+            print(f"Recording stopped unexpectedly: {self.recorder.summary()}")
+            self.recorder.stop()
+            self.recorder = None
+            self.preview.set_paused(False)
+            self.record_error_end_time = time.time() + 3
+
+    def draw_status(self, frame):
+        """
+        Drawn every frame, active or not: a recording keeps running after the
+        hands drop, so the user can work in the recorded region.
+        """
+        self._poll_recorder()
+        if time.time() < self.record_error_end_time:
+            self.app.draw_text(frame, "Recording stopped: error", (10, self.app.WEBCAM_HEIGHT - 40),
+                               color=(0, 0, 255))
+        if self.recorder:
+            self.app.draw_text(frame, f"REC {self.recorder.elapsed:.0f}s  {self.recorder.achieved_fps:.1f} fps  "
+                                      f"{self.recorder.dropped} dropped",
+                               (10, self.app.WEBCAM_HEIGHT - 40), color=(0, 0, 255))
+        return frame
+
     def reset_state(self):
+        # Deliberately leaves any recording running; only the gesture stops it.
+        self.record_gesture_frames = 0
         self.smoothed_coords = None
+        self.current_region = None
+        self.current_monitor = None
         self.is_capture_mode = False
+        self.preview.update_region(None)
+
+    def on_shutdown(self):
+        if self.recorder:
+            self._stop_recording(wait=True)
+        self.preview.stop()
 
     # --- Helper Functions ---
     def _is_pinky_up(self, hand_landmarks):
@@ -195,7 +260,7 @@ class ScreenshotExtension(GestureExtension):
                 ny = 0.0; is_snapped = True
             elif ny > 1 - EDGE_MARGIN:
                 ny = 1.0; is_snapped = True
-            raw_coords.append((nx * self.app.SCREEN_WIDTH, ny * self.app.SCREEN_HEIGHT))
+            raw_coords.append(self.app.screen.to_screen(nx, ny))
         return is_snapped, raw_coords
 
     def _smooth_coordinates(self, raw_coords):
@@ -208,10 +273,3 @@ class ScreenshotExtension(GestureExtension):
                 (SMOOTHING_FACTOR * current) + ((1 - SMOOTHING_FACTOR) * smoothed)
                 for current, smoothed in zip(current_box, self.smoothed_coords)
             )
-
-    def _clamp_coordinates(self, x, y, w, h):
-        x = max(0, x)
-        y = max(0, y)
-        w = min(self.app.SCREEN_WIDTH - x, w)
-        h = min(self.app.SCREEN_HEIGHT - y, h)
-        return w, h
@@ -1,15 +1,19 @@
+import time
 import cv2
 import mediapipe as mp
 import pyautogui
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
+from capture.monitors import MonitorTopology
+from qos_controller import QualityController
 
 # --- CONFIGURATION ---
 WEBCAM_REQ_WIDTH = 640
 WEBCAM_REQ_HEIGHT = 480
 PREVIEW_WIDTH = 480
 UI_TRANSPARENCY = 0.75
+FRAME_BUDGET_MS = 40  # Per-frame latency target the QoS controller steers towards
 
 class GestureAppBase:
     """
@@ -28,6 +32,7 @@ class GestureAppBase:
 
         # --- State Variables ---
         self.last_screenshot_path = None
+        self.frame_is_outlier = False
 
         # --- Extension Management ---
         self.extensions = []
@@ -35,10 +40,7 @@ class GestureAppBase:
 
         # --- Initialize MediaPipe & OpenCV ---
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False, max_num_hands=2,
-            min_detection_confidence=0.7, min_tracking_confidence=0.5
-        )
+        self.qos = QualityController(self.mp_hands, FRAME_BUDGET_MS)
         self.mp_drawing = mp.solutions.drawing_utils
 
         self.cap = cv2.VideoCapture(0)
@@ -57,6 +59,7 @@ class GestureAppBase:
 
         self.WEBCAM_HEIGHT, self.WEBCAM_WIDTH, _ = frame.shape
         self.SCREEN_WIDTH, self.SCREEN_HEIGHT = pyautogui.size()
+        self.screen = MonitorTopology(self.root)
 
         # --- Setup GUI and Position Window ---
         self.setup_gui()
@@ -110,8 +113,11 @@ class GestureAppBase:
         print("Closing application...")
         if self.active_extension and hasattr(self.active_extension, 'on_close'):
             self.active_extension.on_close()
+        for ext in self.extensions:
+            if hasattr(ext, 'on_shutdown'):
+                ext.on_shutdown()
         self.cap.release()
-        self.hands.close()
+        self.qos.close()
         self.root.destroy()
 
     def load_extensions(self, *extensions):
@@ -126,11 +132,13 @@ class GestureAppBase:
         if not ret:
             self.root.after(15, self.update_frame)
             return
+        # Measured from frame arrival, so waiting on the camera doesn't count
+        frame_start = time.perf_counter()
 
         frame = cv2.flip(frame, 1)
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         rgb_frame.flags.writeable = False
-        results = self.hands.process(rgb_frame)
+        results = self.qos.process(rgb_frame)
         rgb_frame.flags.writeable = True
 
         if self.active_extension:
@@ -148,6 +156,10 @@ class GestureAppBase:
         else:
             self.draw_text(frame, "Show hands to begin", (10, 30))
 
+        for ext in self.extensions:
+            if hasattr(ext, 'draw_status'):
+                frame = ext.draw_status(frame)
+
         webcam_img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
         webcam_photo = ImageTk.PhotoImage(image=webcam_img)
         self.webcam_label.configure(image=webcam_photo)
@@ -161,6 +173,9 @@ class GestureAppBase:
             self.preview_label.configure(image=self.placeholder_img)
             self.preview_label.image = self.placeholder_img
 
+        if not self.frame_is_outlier:
+            self.qos.end_frame(time.perf_counter() - frame_start)
+        self.frame_is_outlier = False
         self.root.after(15, self.update_frame)
 
     def release_active_extension(self):
@@ -169,6 +184,10 @@ class GestureAppBase:
             print(f"Releasing extension: {type(self.active_extension).__name__}")
             self.active_extension = None
 
+    def mark_frame_outlier(self):
+        """Keeps the current frame's timing out of the QoS averages (e.g. a blocking capture)."""
+        self.frame_is_outlier = True
+
     def draw_text(self, frame, text, position, color=(255, 255, 255), font_scale=0.8, thickness=2):
         cv2.putText(frame, text, position, cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 0), thickness + 2)
         cv2.putText(frame, text, position, cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness)
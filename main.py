@@ -10,6 +10,8 @@ if __name__ == "__main__":
         os.makedirs("screenshots")
     if not os.path.exists("annotated"):
         os.makedirs("annotated")
+    if not os.path.exists("recordings"):
+        os.makedirs("recordings")
 
     root = tk.Tk()
     app = GestureAppBase(root)
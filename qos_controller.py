@@ -0,0 +1,136 @@
+import time
+from collections import namedtuple
+
+import cv2
+
+QualityLevel = namedtuple("QualityLevel", [
+    "model_complexity", "input_scale", "min_detection_confidence", "min_tracking_confidence"])
+
+# --- CONFIGURATION ---
+# Ordered from best quality to cheapest. Level 0 matches the original fixed settings.
+QUALITY_LEVELS = [
+    QualityLevel(1, 1.0, 0.7, 0.5),
+    QualityLevel(1, 0.75, 0.7, 0.5),
+    QualityLevel(0, 0.75, 0.65, 0.5),
+    QualityLevel(0, 0.5, 0.6, 0.45),
+    QualityLevel(0, 0.35, 0.5, 0.4),
+]
+EMA_ALPHA = 0.1
+MAX_SAMPLE_RATIO = 2.0  # Frame times are clamped to this multiple of the budget before averaging
+DOWNGRADE_RATIO = 1.0  # Step down once smoothed frame time exceeds the budget
+UPGRADE_RATIO = 0.7  # Step up only if the predicted frame time stays under this share of it
+DOWNGRADE_COOLDOWN_FRAMES = 30
+UPGRADE_COOLDOWN_FRAMES = 150
+ESTIMATE_MAX_AGE_FRAMES = 900  # Per-level cost estimates expire after this many frames (~30 s)
+
+
+class QualityController:
+    """
+    Owns the MediaPipe Hands model and keeps the per-frame latency inside a
+    budget by moving along QUALITY_LEVELS: model complexity, inference input
+    scale and detection/tracking confidences.
+
+    Inference and end-to-end frame times are tracked as moving averages. Going
+    down a level happens quickly when the budget is blown; going up waits
+    longer and only happens if the inference cost last measured at that level
+    would still fit, which keeps it from oscillating. Those measurements
+    expire after ESTIMATE_MAX_AGE_FRAMES, so a slow spell (warm-up, another
+    busy process) can't pin the controller below full quality forever; an
+    expired level is simply tried again.
+    """
+
+    def __init__(self, mp_hands, budget_ms, level=0):
+        self.mp_hands = mp_hands
+        self.budget = budget_ms / 1000.0
+        self.level = level
+        self.hands = self._build(self.quality)
+
+        self.inference_ema = None
+        self.frame_ema = None
+        self.frames_since_switch = 0
+        self.frame_count = 0
+        self.level_inference = {}  # level -> (smoothed inference time seen there, frame_count)
+        self._last_rgb_frame = None
+
+    @property
+    def quality(self):
+        return QUALITY_LEVELS[self.level]
+
+    def process(self, rgb_frame):
+        """Runs hand tracking on a frame at the current input scale."""
+        self._last_rgb_frame = rgb_frame
+        start = time.perf_counter()
+        results = self.hands.process(self._scale(rgb_frame, self.quality))
+        self.inference_ema = self._ema(self.inference_ema, time.perf_counter() - start)
+        return results
+
+    def end_frame(self, frame_seconds):
+        """Records the end-to-end time of a frame and adjusts quality if needed."""
+        # One stalled frame shouldn't be enough to force a downgrade on its own.
+        self.frame_ema = self._ema(self.frame_ema, min(frame_seconds, self.budget * MAX_SAMPLE_RATIO))
+        self.frames_since_switch += 1
+        self.frame_count += 1
+
+        if (self.frame_ema > self.budget * DOWNGRADE_RATIO and
+                self.level < len(QUALITY_LEVELS) - 1 and
+                self.frames_since_switch >= DOWNGRADE_COOLDOWN_FRAMES):
+            self._switch(self.level + 1, "over budget")
+        elif (self.level > 0 and
+                self.frames_since_switch >= UPGRADE_COOLDOWN_FRAMES and
+                self._predicted_frame_time(self.level - 1) < self.budget * UPGRADE_RATIO):
+            self._switch(self.level - 1, "headroom")
+
+    def close(self):
+        self.hands.close()
+
+    # --- Helpers ---
+    def _predicted_frame_time(self, level):
+        # With no recent history for that level, assume it costs what we pay now.
+        inference, measured_at = self.level_inference.get(level, (self.inference_ema, self.frame_count))
+        if self.frame_count - measured_at > ESTIMATE_MAX_AGE_FRAMES:
+            inference = self.inference_ema
+        return self.frame_ema - self.inference_ema + inference
+
+    def _switch(self, level, reason):
+        old_level, old_quality = self.level, self.quality
+        self.level_inference[old_level] = (self.inference_ema, self.frame_count)
+        print(f"QoS: level {old_level} -> {level} ({reason}): "
+              f"frame {self.frame_ema * 1000:.1f} ms, inference {self.inference_ema * 1000:.1f} ms, "
+              f"budget {self.budget * 1000:.0f} ms; {QUALITY_LEVELS[level]}")
+        self.level = level
+
+        new_quality = self.quality
+        if (new_quality.model_complexity, new_quality.min_detection_confidence,
+                new_quality.min_tracking_confidence) != (old_quality.model_complexity,
+                                                         old_quality.min_detection_confidence,
+                                                         old_quality.min_tracking_confidence):
+            old_hands, self.hands = self.hands, self._build(new_quality)
+            # Prime the new graph with the last frame so it starts out tracking
+            # the hands that are already up, instead of dropping them for a frame.
+            if self._last_rgb_frame is not None:
+                self.hands.process(self._scale(self._last_rgb_frame, new_quality))
+            old_hands.close()
+
+        self.inference_ema = None
+        self.frame_ema = None
+        self.frames_since_switch = 0
+
+    def _build(self, quality):
+        return self.mp_hands.Hands(
+            static_image_mode=False, max_num_hands=2,
+            model_complexity=quality.model_complexity,
+            min_detection_confidence=quality.min_detection_confidence,
+            min_tracking_confidence=quality.min_tracking_confidence
+        )
+
+    @staticmethod
+    def _scale(rgb_frame, quality):
+        # Landmarks are normalized, so downstream code never sees the scale.
+        if quality.input_scale >= 1.0:
+            return rgb_frame
+        return cv2.resize(rgb_frame, None, fx=quality.input_scale, fy=quality.input_scale,
+                          interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def _ema(current, sample):
+        return sample if current is None else EMA_ALPHA * sample + (1 - EMA_ALPHA) * current
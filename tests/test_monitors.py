@@ -0,0 +1,64 @@
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("PIL")
+pytest.importorskip("pyautogui")
+
+from capture.monitors import Monitor, MonitorTopology
+
+# A 1920x1080 primary with a taller 1280x1024 monitor to its left, offset down.
+LAYOUT = [
+    Monitor(0, 0, 1920, 1080, 1.0),
+    Monitor(-1280, 200, 1280, 1024, 1.5),
+]
+
+
+@pytest.fixture
+def topology():
+    with mock.patch.object(MonitorTopology, "_enumerate", return_value=list(LAYOUT)), \
+            mock.patch.object(MonitorTopology, "_layout_signature", return_value=("two",)):
+        yield MonitorTopology(mock.Mock())
+
+
+def test_virtual_desktop_spans_all_monitors(topology):
+    assert topology.virtual[:4] == (-1280, 0, 3200, 1224)
+
+
+def test_to_screen_and_to_normalized_round_trip(topology):
+    assert topology.to_screen(0.0, 0.0) == (-1280, 0)
+    assert topology.to_screen(1.0, 1.0) == (1920, 1224)
+    x, y = topology.to_screen(0.25, 0.75)
+    assert topology.to_normalized(x, y) == pytest.approx((0.25, 0.75))
+
+
+def test_monitor_at_picks_containing_or_nearest(topology):
+    assert topology.monitor_at(100, 100) == LAYOUT[0]
+    assert topology.monitor_at(-10, 500) == LAYOUT[1]
+    # The dead zone above the left monitor snaps to the nearest one.
+    assert topology.monitor_at(-600, 50) == LAYOUT[1]
+    assert topology.monitor_at(1000, 1200) == LAYOUT[0]
+
+
+def test_clip_region_stays_on_monitor_under_centre(topology):
+    monitor, region = topology.clip_region(-400, 100, 200, 600)
+    assert monitor == LAYOUT[1]
+    assert region == (-400, 200, 400, 400)
+
+    monitor, region = topology.clip_region(-100, 1000, 700, 1200)
+    assert monitor == LAYOUT[0]
+    assert region == (0, 1000, 700, 80)
+
+
+def test_layout_is_only_reread_when_signature_changes(topology):
+    with mock.patch.object(MonitorTopology, "_enumerate", return_value=LAYOUT[:1]) as enumerate_, \
+            mock.patch.object(MonitorTopology, "_layout_signature", return_value=("two",)) as signature:
+        topology._check_layout()
+        topology.refresh()
+        enumerate_.assert_not_called()
+
+        signature.return_value = ("one",)
+        topology._check_layout()
+        topology.refresh()
+        enumerate_.assert_called_once()
+    assert topology.monitors == LAYOUT[:1]
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+pytest.importorskip("PIL")
+
+from PIL import Image, ImageDraw
+
+from capture.storage import ScreenshotStore
+
+
+def text_capture(text, size=(400, 120)):
+    image = Image.new("RGB", size, "white")
+    ImageDraw.Draw(image).text((20, 40), text, fill="black")
+    return image
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ScreenshotStore(str(tmp_path))
+
+
+def blob_files(store):
+    return [f for _, _, files in os.walk(store.objects_dir) for f in files]
+
+
+def test_identical_grab_is_exact_hit(store):
+    first = store.save(text_capture("Total: 41"))
+    second = store.save(text_capture("Total: 41"))
+
+    assert first != second
+    assert store.exact_hits == 1
+    assert len(blob_files(store)) == 1
+    assert os.path.samefile(first, second)
+
+
+def test_one_character_change_gets_its_own_blob(store):
+    first = store.save(text_capture("Total: 41"))
+    second = store.save(text_capture("Total: 47"))
+
+    assert store.exact_hits == store.near_hits == 0
+    assert len(blob_files(store)) == 2
+    with Image.open(second) as saved:
+        assert saved.tobytes() == text_capture("Total: 47").tobytes()
+    assert not os.path.samefile(first, second)
+
+
+def test_same_bytes_different_shape_is_not_a_hit(store):
+    wide = store.save(Image.new("RGB", (200, 100), "white"))
+    tall = store.save(Image.new("RGB", (100, 200), "white"))
+
+    assert store.exact_hits == store.near_hits == 0
+    with Image.open(wide) as a, Image.open(tall) as b:
+        assert (a.size, b.size) == ((200, 100), (100, 200))
+
+
+def test_index_survives_reload(store):
+    store.save(text_capture("Total: 41"))
+    reloaded = ScreenshotStore(store.root_dir)
+    reloaded.save(text_capture("Total: 41"))
+
+    assert reloaded.exact_hits == 1
+    assert len(reloaded.names) == 2
+
+
+def test_sub_threshold_noise_is_near_hit(store):
+    first = store.save(text_capture("Total: 41"))
+    noisy = text_capture("Total: 41")
+    noisy.putpixel((5, 5), (254, 254, 254))
+    second = store.save(noisy)
+
+    assert store.near_hits == 1
+    assert os.path.samefile(first, second)